@@ -2,13 +2,15 @@
 
 from .complexity import analyze_code_complexity, summarize_differences
 from .co2 import estimate_co2_impact
-from .suggestions import SuggestionEngine
+from .suggestions import AIClient, SuggestionEngine, SuggestionStore
 from .project_analyzer import analyze_project
 
 __all__ = [
     "analyze_code_complexity",
     "summarize_differences",
     "estimate_co2_impact",
+    "AIClient",
     "SuggestionEngine",
+    "SuggestionStore",
     "analyze_project",
 ]
@@ -0,0 +1,26 @@
+"""Regex engine selection for the analysis heuristics."""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+try:  # pragma: no cover - optional DFA-based engine
+    import re2 as _re2
+except ImportError:  # pragma: no cover
+    _re2 = None
+
+
+def compile_pattern(pattern: str) -> Any:
+    """Compile ``pattern`` with google-re2 when available, falling back to ``re``.
+
+    re2 scans in linear time without backtracking, which matters for large pasted files
+    and whole-project scans. Its ``compile`` does not accept ``re`` flags, so patterns
+    must carry their flags inline (e.g. ``(?m)``). Patterns re2 rejects use ``re``.
+    """
+    if _re2 is not None:
+        try:
+            return _re2.compile(pattern)
+        except _re2.error:
+            pass
+    return re.compile(pattern)
@@ -2,22 +2,30 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Dict
 
 # Average data center emissions factor (gCO2eq per kWh)
 GLOBAL_AVG_CO2_PER_KWH = 475.0
 
-def _estimate_energy_kwh(lines_of_code: int, complexity: float) -> float:
-    # Scaling constant chosen for demo purposes
-    return round(max(lines_of_code, 1) * max(complexity, 1) / 50000, 4)
+# Scaling constant chosen for demo purposes: kWh per (line of code x complexity point)
+_KWH_PER_UNIT = 1 / 50000
+_CO2_KG_PER_KWH = GLOBAL_AVG_CO2_PER_KWH / 1000
 
 
-def estimate_co2_impact(report: Dict[str, float]) -> Dict[str, float]:
-    energy = _estimate_energy_kwh(
-        int(report.get("lines_of_code", 0)), float(report.get("estimated_complexity", 0))
-    )
-    co2 = round(energy * GLOBAL_AVG_CO2_PER_KWH / 1000, 4)
+@lru_cache(maxsize=1024)
+def _co2_impact(lines_of_code: float, estimated_complexity: float) -> Dict[str, float]:
+    energy = max(int(lines_of_code), 1) * max(float(estimated_complexity), 1) * _KWH_PER_UNIT
     return {
-        "energy_kwh": energy,
-        "co2_kg": co2,
+        "energy_kwh": round(energy, 4),
+        "co2_kg": round(energy * _CO2_KG_PER_KWH, 4),
     }
+
+
+def estimate_co2_impact(report: Dict[str, float]) -> Dict[str, float]:
+    """Project energy and CO2 for a report; only its LOC and complexity fields are used.
+
+    Results are memoized on those two numbers, and each caller gets its own copy.
+    """
+    return dict(_co2_impact(report.get("lines_of_code", 0), report.get("estimated_complexity", 0)))
+
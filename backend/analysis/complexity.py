@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 import re
-from collections import Counter
+from collections import Counter, deque
 from dataclasses import dataclass
-from typing import Dict, List, Sequence
+from typing import Deque, Dict, Tuple
 
 LOOP_KEYWORDS = {
     "python": ["for", "while"],
@@ -34,6 +34,41 @@ FUNCTION_KEYWORDS = {
 SUPPORTED_LANGUAGES = {"python", "java", "javascript", "html", "css"}
 
 
+def _keyword_alternative(keyword: str) -> str:
+    # Only anchor word boundaries on word characters; "=>" or "@media" would never match otherwise.
+    escaped = re.escape(keyword)
+    prefix = r"\b" if keyword[0].isalnum() or keyword[0] == "_" else ""
+    suffix = r"\b" if keyword[-1].isalnum() or keyword[-1] == "_" else ""
+    return prefix + escaped + suffix
+
+
+_KEYWORD_TABLES = (
+    ("loops", LOOP_KEYWORDS),
+    ("conditionals", CONDITIONAL_KEYWORDS),
+    ("functions", FUNCTION_KEYWORDS),
+)
+
+# Matched keyword -> category it counts towards, per language.
+_KEYWORD_CATEGORIES: Dict[str, Dict[str, str]] = {
+    language: {keyword: category for category, table in _KEYWORD_TABLES for keyword in table[language]}
+    for language in SUPPORTED_LANGUAGES
+}
+
+
+def _compile_keyword_pattern(language: str) -> re.Pattern[str] | None:
+    keywords = sorted(_KEYWORD_CATEGORIES[language], key=len, reverse=True)
+    if not keywords:
+        return None
+    # Plain literal alternation cannot backtrack, and the stdlib engine's findall is
+    # cheaper per match than re2's wrapper, so this pattern stays on ``re``.
+    return re.compile("|".join(_keyword_alternative(keyword) for keyword in keywords))
+
+
+# One alternation per language so the source is scanned once; findall + Counter keep the
+# per-match work in C and the few distinct keywords are then folded into their categories.
+_KEYWORD_PATTERNS = {language: _compile_keyword_pattern(language) for language in SUPPORTED_LANGUAGES}
+
+
 @dataclass
 class ComplexityReport:
     language: str
@@ -67,28 +102,63 @@ def _sanitize_language(language: str) -> str:
     return normalized
 
 
-def _count_keywords(code: str, keywords: Sequence[str]) -> int:
-    if not keywords:
-        return 0
-    pattern = r"\\b(" + "|".join(re.escape(keyword) for keyword in keywords) + r")\\b"
-    return len(re.findall(pattern, code))
-
-
-def _count_duplicate_lines(lines: List[str]) -> int:
-    counter = Counter(line for line in lines if line)
-    duplicate_total = sum(count - 1 for count in counter.values() if count > 1)
-    return duplicate_total
-
-
-def _count_repeated_sequences(lines: List[str], window: int = 3) -> int:
-    if len(lines) < window:
-        return 0
-    sequences = Counter(
-        tuple(lines[i : i + window])
-        for i in range(len(lines) - window + 1)
-        if all(line for line in lines[i : i + window])
-    )
-    return sum(count - 1 for count in sequences.values() if count > 1)
+def _count_keywords(code: str, language: str) -> Counter:
+    pattern = _KEYWORD_PATTERNS[language]
+    if pattern is None:
+        return Counter()
+    categories = _KEYWORD_CATEGORIES[language]
+    counts: Counter = Counter()
+    for keyword, count in Counter(pattern.findall(code)).items():
+        counts[categories[keyword]] += count
+    return counts
+
+
+# Rabin-Karp parameters for fingerprinting runs of consecutive lines.
+_WINDOW_BASE = 1_000_003
+_WINDOW_MODULUS = (1 << 61) - 1
+
+
+def _walk_lines(code: str, window: int = 3) -> Tuple[int, Counter, Counter]:
+    """Count non-empty lines, line occurrences and runs of ``window`` lines in one pass.
+
+    Lines are counted by their hash and runs by a rolling hash over per-line fingerprints,
+    so sliding the window costs O(1) instead of rehashing every line in it. A blank line
+    breaks the current run, so only windows made entirely of non-empty lines are counted.
+    """
+    base, modulus = _WINDOW_BASE, _WINDOW_MODULUS
+    lead_weight = pow(base, window - 1, modulus)
+    lines_of_code = 0
+    line_counts: Counter = Counter()
+    window_counts: Counter = Counter()
+    recent: Deque[int] = deque()
+    # Bind the per-line operations once; this loop runs for every line of every file.
+    push, pop_oldest, reset = recent.append, recent.popleft, recent.clear
+    rolling = 0
+    filled = 0
+    for line in map(str.strip, code.splitlines()):
+        if not line:
+            reset()
+            rolling = filled = 0
+            continue
+        lines_of_code += 1
+        # Count by the line's hash: int keys compare in one step where equal strings need a
+        # full memcmp, and a 64-bit collision between distinct lines is negligible here.
+        line_hash = hash(line)
+        line_counts[line_hash] += 1
+        fingerprint = line_hash % modulus
+        if filled == window:
+            rolling -= pop_oldest() * lead_weight
+        else:
+            filled += 1
+        rolling = (rolling * base + fingerprint) % modulus
+        push(fingerprint)
+        if filled == window:
+            window_counts[rolling] += 1
+    return lines_of_code, line_counts, window_counts
+
+
+def _count_repeats(counter: Counter) -> int:
+    return sum(count - 1 for count in counter.values() if count > 1)
 
 
 def _estimate_complexity(loops: int, conditionals: int, functions: int, duplicates: int) -> float:
@@ -101,14 +171,14 @@ def analyze_code_complexity(code: str, language: str) -> Dict[str, float]:
     """Return a simple heuristics-based complexity report."""
 
     normalized_language = _sanitize_language(language)
-    normalized_lines = [line.strip() for line in code.splitlines()]
-    lines_of_code = sum(1 for line in normalized_lines if line)
+    lines_of_code, line_counts, window_counts = _walk_lines(code)
 
-    loops = _count_keywords(code, LOOP_KEYWORDS[normalized_language])
-    conditionals = _count_keywords(code, CONDITIONAL_KEYWORDS[normalized_language])
-    functions = _count_keywords(code, FUNCTION_KEYWORDS[normalized_language])
-    duplicate_lines = _count_duplicate_lines(normalized_lines)
-    repeated_sequences = _count_repeated_sequences(normalized_lines)
+    keyword_counts = _count_keywords(code, normalized_language)
+    loops = keyword_counts["loops"]
+    conditionals = keyword_counts["conditionals"]
+    functions = keyword_counts["functions"]
+    duplicate_lines = _count_repeats(line_counts)
+    repeated_sequences = _count_repeats(window_counts)
 
     report = ComplexityReport(
         language=normalized_language,
@@ -128,13 +198,16 @@ def analyze_code_complexity(code: str, language: str) -> Dict[str, float]:
 def summarize_differences(before: Dict[str, float], after: Dict[str, float]) -> Dict[str, float]:
     """Provide a delta summary between two complexity reports."""
 
-    keys = {
-        "lines_of_code",
-        "loops",
-        "conditionals",
-        "functions",
-        "duplicate_lines",
-        "repeated_sequences",
-        "estimated_complexity",
+    before_get, after_get = before.get, after.get
+    # Every field except estimated_complexity is an int, so only that one needs rounding.
+    return {
+        "lines_of_code": before_get("lines_of_code", 0) - after_get("lines_of_code", 0),
+        "loops": before_get("loops", 0) - after_get("loops", 0),
+        "conditionals": before_get("conditionals", 0) - after_get("conditionals", 0),
+        "functions": before_get("functions", 0) - after_get("functions", 0),
+        "duplicate_lines": before_get("duplicate_lines", 0) - after_get("duplicate_lines", 0),
+        "repeated_sequences": before_get("repeated_sequences", 0) - after_get("repeated_sequences", 0),
+        "estimated_complexity": round(
+            before_get("estimated_complexity", 0) - after_get("estimated_complexity", 0), 2
+        ),
     }
-    return {key: round(before.get(key, 0) - after.get(key, 0), 2) for key in keys}
@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
+import multiprocessing
 import os
-import re
+import posixpath
+import threading
+from array import array
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
+from ._regex import compile_pattern
 from .complexity import analyze_code_complexity, SUPPORTED_LANGUAGES
 
+try:  # pragma: no cover - import shim for running from repo root or backend dir
+    from services.analysis_cache import AnalysisCache
+except ModuleNotFoundError:  # type: ignore
+    from backend.services.analysis_cache import AnalysisCache  # type: ignore
+
 
 def detect_language_from_filename(filename: str) -> str | None:
     """Detect programming language from file extension."""
@@ -26,47 +38,52 @@ def detect_language_from_filename(filename: str) -> str | None:
     return ext_map.get(ext)
 
 
+# Import/require patterns per language, compiled once at import time. Flags are inline
+# because re2 (used when installed) does not accept ``re`` flag arguments.
+_IMPORT_PATTERN_SOURCES: Dict[str, Tuple[str, ...]] = {
+    # Match: import X, from X import Y, from X.Y import Z
+    "python": (
+        r"^\s*import\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)*)",
+        r"^\s*from\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)*)\s+import",
+    ),
+    # Match: import X.Y.Z;
+    "java": (r"^\s*import\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)*)",),
+    # Match: import X from '...', require('...'), const X = require('...')
+    # The import clause is spelled out (default, "* as ns", "{...}") rather than matched with
+    # a lazy ".*?", which backtracks quadratically on long minified lines without "from".
+    "javascript": (
+        r"\bimport\s+(?:[\w$]+\s*,\s*)?(?:[\w$]+|\*\s*as\s+[\w$]+|\{[^{}]*\})\s*from\s*['\"]([^'\"]+)['\"]",
+        r"require\s*\(\s*['\"]([^'\"]+)['\"]",
+        r"import\s*\(\s*['\"]([^'\"]+)['\"]",
+    ),
+    # Match: <script src="...">, <link href="...">
+    "html": (
+        r'<script[^>]+src=["\']([^"\']+)["\']',
+        r'<link[^>]+href=["\']([^"\']+)["\']',
+    ),
+    # Match: @import "..."
+    "css": (r'@import\s+["\']([^"\']+)["\']',),
+}
+
+_IMPORT_PATTERNS: Dict[str, List[Any]] = {
+    language: [compile_pattern("(?mi)" + source) for source in sources]
+    for language, sources in _IMPORT_PATTERN_SOURCES.items()
+}
+
+
 def find_imports_and_dependencies(code: str, language: str) -> Set[str]:
     """Extract import/require statements to find file dependencies."""
     dependencies: Set[str] = set()
-    
-    if language == "python":
-        # Match: import X, from X import Y, from X.Y import Z
-        patterns = [
-            r"^\s*import\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)*)",
-            r"^\s*from\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)*)\s+import",
-        ]
-    elif language == "java":
-        # Match: import X.Y.Z;
-        patterns = [r"^\s*import\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)*)"]
-    elif language == "javascript":
-        # Match: import X from '...', require('...'), const X = require('...')
-        patterns = [
-            r"import\s+.*?\s+from\s+['\"]([^'\"]+)['\"]",
-            r"require\s*\(\s*['\"]([^'\"]+)['\"]",
-            r"import\s*\(\s*['\"]([^'\"]+)['\"]",
-        ]
-    elif language == "html":
-        # Match: <script src="...">, <link href="...">
-        patterns = [
-            r'<script[^>]+src=["\']([^"\']+)["\']',
-            r'<link[^>]+href=["\']([^"\']+)["\']',
-        ]
-    elif language == "css":
-        # Match: @import "..."
-        patterns = [r'@import\s+["\']([^"\']+)["\']']
-    else:
-        return dependencies
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, code, re.MULTILINE | re.IGNORECASE)
-        dependencies.update(matches)
-    
+    for pattern in _IMPORT_PATTERNS.get(language, ()):
+        dependencies.update(pattern.findall(code))
     return dependencies
 
 
-def normalize_dependency_path(dep: str, current_file: str, project_root: str) -> str | None:
-    """Normalize dependency path to a project file path."""
+_RESOLVE_EXTENSIONS = (".py", ".java", ".js", ".jsx", ".html", ".css")
+
+
+def normalize_dependency_path(dep: str, current_file: str, known_paths: FrozenSet[str]) -> str | None:
+    """Normalize dependency path to one of the project's ``known_paths``."""
     # Remove query strings and fragments
     dep = dep.split("?")[0].split("#")[0]
     
@@ -76,93 +93,204 @@ def normalize_dependency_path(dep: str, current_file: str, project_root: str) ->
     
     # Remove leading ./ or ../
     dep = dep.lstrip("./")
+    if not dep:
+        return None
     
-    # Try to resolve relative to current file
-    current_dir = os.path.dirname(current_file)
-    if current_dir:
-        potential = os.path.normpath(os.path.join(project_root, current_dir, dep))
-    else:
-        potential = os.path.normpath(os.path.join(project_root, dep))
-    
-    # Check if file exists
-    if os.path.exists(potential) and os.path.isfile(potential):
-        return os.path.relpath(potential, project_root)
-    
-    # Try direct path from project root
-    potential = os.path.normpath(os.path.join(project_root, dep))
-    if os.path.exists(potential) and os.path.isfile(potential):
-        return os.path.relpath(potential, project_root)
-    
-    # Try with common extensions
-    for ext in [".py", ".java", ".js", ".jsx", ".html", ".css"]:
-        potential_ext = potential + ext
-        if os.path.exists(potential_ext):
-            return os.path.relpath(potential_ext, project_root)
+    # Try relative to the current file, then from the project root (archive paths always
+    # use "/"), each as written and then with common extensions
+    current_dir = posixpath.dirname(current_file)
+    for potential in (posixpath.normpath(posixpath.join(current_dir, dep)), posixpath.normpath(dep)):
+        if potential in known_paths:
+            return potential
+        for ext in _RESOLVE_EXTENSIONS:
+            if potential + ext in known_paths:
+                return potential + ext
     
     return None
 
 
+@dataclass
+class FileTable:
+    """Per-file project results stored column-wise.
+
+    Aggregation reads the contiguous ``loc``/``complexity`` arrays instead of walking a
+    dict per file; the per-file dicts are only built for the JSON response.
+    """
+
+    paths: List[str] = field(default_factory=list)
+    languages: List[str] = field(default_factory=list)
+    loc: array = field(default_factory=lambda: array("q"))
+    complexity: array = field(default_factory=lambda: array("d"))
+    metrics: List[Dict[str, float]] = field(default_factory=list)
+    dependencies: List[List[str]] = field(default_factory=list)
+    errors: List[Optional[str]] = field(default_factory=list)
+
+    def append(
+        self,
+        path: str,
+        language: str,
+        metrics: Dict[str, float],
+        dependencies: List[str],
+        error: Optional[str] = None,
+    ) -> None:
+        self.paths.append(path)
+        self.languages.append(language)
+        self.loc.append(int(metrics.get("lines_of_code", 0)))
+        self.complexity.append(float(metrics.get("estimated_complexity", 0)))
+        self.metrics.append(metrics)
+        self.dependencies.append(dependencies)
+        self.errors.append(error)
+
+    def as_dict(self) -> Dict[str, Dict]:
+        files: Dict[str, Dict] = {}
+        for path, language, metrics, dependencies, error in zip(
+            self.paths, self.languages, self.metrics, self.dependencies, self.errors
+        ):
+            entry: Dict[str, Any] = {"language": language, "metrics": metrics, "dependencies": dependencies}
+            if error is not None:
+                entry["error"] = error
+            files[path] = entry
+        return files
+
+
+# Below this many files the cost of starting worker processes outweighs the parallel speedup.
+PARALLEL_MIN_FILES = 20
+
+
+def _analyze_file(task: Tuple[str, str]) -> Tuple[Dict[str, float], List[str], Optional[str]]:
+    """Analyze one ``(content, language)`` pair; errors are returned rather than raised."""
+    content, language = task
+    try:
+        metrics = analyze_code_complexity(content, language)
+        dependencies = find_imports_and_dependencies(content, language)
+    except Exception as e:
+        return {}, [], str(e)
+    return metrics, list(dependencies), None
+
+
+# Shared worker pool, created on first use. Workers start via forkserver (spawn where that
+# is unavailable) because the server process is multithreaded, and forking it could hand
+# the children locks held by other threads.
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _process_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context(method))
+        return _process_pool
+
+
+def _discard_process_pool(pool: ProcessPoolExecutor) -> None:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_file_analyses(
+    tasks: List[Tuple[str, str]],
+) -> List[Tuple[Dict[str, float], List[str], Optional[str]]]:
+    if len(tasks) < PARALLEL_MIN_FILES or (os.cpu_count() or 1) < 2:
+        return [_analyze_file(task) for task in tasks]
+    # Processes rather than threads: the regex scans and line walk hold the GIL.
+    pool = _get_process_pool()
+    try:
+        return list(pool.map(_analyze_file, tasks, chunksize=32))
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool next time and finish this batch in-process.
+        _discard_process_pool(pool)
+        return [_analyze_file(task) for task in tasks]
+
+
 def analyze_project(
-    project_files: Dict[str, str], project_root: str = ""
+    project_files: Dict[str, str],
+    cache: Optional[AnalysisCache] = None,
 ) -> Dict[str, any]:
-    """Analyze a multi-file project and detect interconnections."""
+    """Analyze a multi-file project and detect interconnections.
+
+    When ``cache`` is given, files whose content was analyzed before are served from it
+    and newly analyzed files are added to it.
+    """
     
-    file_analyses: Dict[str, Dict] = {}
+    table = FileTable()
     interconnections: List[Dict[str, str]] = []
     dependency_graph: Dict[str, Set[str]] = defaultdict(set)
     
-    # First pass: analyze each file
-    for filepath, content in project_files.items():
+    candidates: List[Tuple[str, str]] = []
+    for filepath in project_files:
         language = detect_language_from_filename(filepath)
-        if not language or language not in SUPPORTED_LANGUAGES:
+        if language and language in SUPPORTED_LANGUAGES:
+            candidates.append((filepath, language))
+    
+    content_hashes: Dict[str, str] = {}
+    cached: Dict[Tuple[str, str], Tuple[Dict[str, float], List[str]]] = {}
+    if cache is not None:
+        content_hashes = {
+            filepath: cache.content_hash(project_files[filepath]) for filepath, _ in candidates
+        }
+        cached = cache.lookup(
+            (content_hashes[filepath], language) for filepath, language in candidates
+        )
+    misses = [
+        (filepath, language)
+        for filepath, language in candidates
+        if (content_hashes.get(filepath, ""), language) not in cached
+    ]
+    analyzed = dict(
+        zip(
+            (filepath for filepath, _ in misses),
+            _run_file_analyses([(project_files[filepath], language) for filepath, language in misses]),
+        )
+    )
+    fresh: List[Tuple[str, str, Dict[str, float], List[str]]] = []
+    
+    # First pass: collect per-file results
+    for filepath, language in candidates:
+        if filepath in analyzed:
+            metrics, dependency_list, error = analyzed[filepath]
+            if error is None and cache is not None:
+                fresh.append((content_hashes[filepath], language, metrics, dependency_list))
+        else:
+            metrics, dependency_list = cached[(content_hashes[filepath], language)]
+            error = None
+        
+        if error is not None:
+            table.append(filepath, language, {}, [], error)
             continue
         
-        try:
-            metrics = analyze_code_complexity(content, language)
-            dependencies = find_imports_and_dependencies(content, language)
-            
-            file_analyses[filepath] = {
-                "language": language,
-                "metrics": metrics,
-                "dependencies": list(dependencies),
-                "lines_of_code": metrics.get("lines_of_code", 0),
-            }
-            
-            dependency_graph[filepath] = dependencies
-        except Exception as e:
-            file_analyses[filepath] = {
-                "language": language,
-                "error": str(e),
-                "metrics": {},
-                "dependencies": [],
-            }
+        table.append(filepath, language, metrics, dependency_list)
+        dependency_graph[filepath] = set(dependency_list)
+    
+    if cache is not None:
+        cache.store(fresh)
     
     # Second pass: resolve interconnections
+    languages_by_path = dict(zip(table.paths, table.languages))
+    known_paths = frozenset(table.paths)
     for filepath, deps in dependency_graph.items():
         for dep in deps:
-            resolved = normalize_dependency_path(dep, filepath, project_root)
-            if resolved and resolved in file_analyses:
+            resolved = normalize_dependency_path(dep, filepath, known_paths)
+            if resolved and resolved in languages_by_path:
                 interconnections.append({
                     "from": filepath,
                     "to": resolved,
-                    "type": "import" if file_analyses[filepath]["language"] in ["python", "java", "javascript"] else "reference",
+                    "type": "import" if languages_by_path[filepath] in ["python", "java", "javascript"] else "reference",
                 })
     
     # Aggregate statistics
-    total_files = len(file_analyses)
-    total_loc = sum(f.get("lines_of_code", 0) for f in file_analyses.values())
-    total_complexity = sum(f.get("metrics", {}).get("estimated_complexity", 0) for f in file_analyses.values())
-    languages_used = set(f.get("language") for f in file_analyses.values() if f.get("language"))
-    
     return {
-        "files": file_analyses,
+        "files": table.as_dict(),
         "interconnections": interconnections,
         "summary": {
-            "total_files": total_files,
-            "total_lines_of_code": total_loc,
-            "total_complexity": round(total_complexity, 2),
-            "languages": list(languages_used),
+            "total_files": len(table.paths),
+            "total_lines_of_code": sum(table.loc),
+            "total_complexity": round(sum(table.complexity), 2),
+            "languages": list(set(table.languages)),
             "interconnection_count": len(interconnections),
         },
     }
-
@@ -2,19 +2,58 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
+import re
 import textwrap
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Protocol
 
 try:  # pragma: no cover - import shim for running from repo root or backend dir
+    from services.json_codec import loads as _json_loads
+    from services.lru_cache import LRUCache
     from services.ollama_client import OllamaClient
 except ModuleNotFoundError:  # type: ignore
+    from backend.services.json_codec import loads as _json_loads  # type: ignore
+    from backend.services.lru_cache import LRUCache  # type: ignore
     from backend.services.ollama_client import OllamaClient  # type: ignore
 
+_JSON_STRUCTURE = re.compile(r'[{}"\\]')
+
+
+class AIClient(Protocol):
+    """Interface a text-generation backend must provide to drive the suggestion engine."""
+
+    model: str
+
+    def is_configured(self) -> bool: ...
+
+    def generate(self, prompt: str) -> Optional[str]: ...
+
+
+class SuggestionStore(Protocol):
+    """Persistent tier behind the in-memory suggestion cache, e.g. ``AnalysisCache``."""
+
+    def get_suggestion(self, key: str) -> Optional[Dict[str, object]]: ...
+
+    def put_suggestion(self, key: str, suggestion: Dict[str, object]) -> None: ...
+
 
 class SuggestionEngine:
-    def __init__(self, ai_client: Optional[OllamaClient] = None) -> None:
+    def __init__(
+        self,
+        ai_client: Optional[AIClient] = None,
+        cache_size: int = 512,
+        store: Optional[SuggestionStore] = None,
+    ) -> None:
         self.ai_client = ai_client or OllamaClient()
+        self._cache = LRUCache(maxsize=cache_size)
+        self._store = store
+
+    def _cache_key(self, code: str, language: str, metrics: Dict[str, float]) -> str:
+        digest = hashlib.blake2b(code.encode("utf-8", errors="surrogatepass"), digest_size=16)
+        # the model is part of the key so switching models doesn't serve the old model's output
+        digest.update(f"\0{language}\0{getattr(self.ai_client, 'model', '')}\0".encode())
+        digest.update(repr(tuple(sorted(metrics.items()))).encode())
+        return digest.hexdigest()
 
     def _build_prompt(self, code: str, language: str, metrics: Dict[str, float]) -> str:
         schema = textwrap.dedent(
@@ -80,21 +119,53 @@ class SuggestionEngine:
             "used_fallback": True,
         }
 
+    @staticmethod
+    def _first_json_object(text: str) -> Optional[str]:
+        """Return the first balanced ``{...}`` in ``text``, ignoring braces inside strings."""
+        start = text.find("{")
+        if start == -1:
+            return None
+        depth = 0
+        in_string = False
+        escaped_at = -1
+        # Jump straight between structural characters instead of stepping through every char.
+        for match in _JSON_STRUCTURE.finditer(text, start):
+            position = match.start()
+            if position == escaped_at:
+                continue
+            char = match.group()
+            if in_string:
+                if char == "\\":
+                    escaped_at = position + 1
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start : match.end()]
+        return None
+
     @staticmethod
     def _parse_json_output(ai_output: str) -> Optional[Dict[str, object]]:
         trimmed = ai_output.strip()
         if not trimmed:
             return None
+        if trimmed.startswith("{"):
+            try:
+                return _json_loads(trimmed)
+            except ValueError:
+                pass
         # Attempt to isolate JSON if extraneous text sneaks in.
-        if not trimmed.startswith("{"):
-            start = trimmed.find("{")
-            end = trimmed.rfind("}")
-            if start == -1 or end == -1:
-                return None
-            trimmed = trimmed[start : end + 1]
+        candidate = SuggestionEngine._first_json_object(trimmed)
+        if candidate is None:
+            return None
         try:
-            return json.loads(trimmed)
-        except json.JSONDecodeError:
+            return _json_loads(candidate)
+        except ValueError:
             return None
 
     @staticmethod
@@ -115,6 +186,16 @@ class SuggestionEngine:
         return normalized
 
     def generate(self, code: str, language: str, metrics: Dict[str, float]) -> Dict[str, object]:
+        cache_key = self._cache_key(code, language, metrics)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+        if self._store is not None:
+            stored = self._store.get_suggestion(cache_key)
+            if stored is not None:
+                self._cache.put(cache_key, stored)
+                return stored
+
         prompt = self._build_prompt(code, language, metrics)
         ai_output = None
         if self.ai_client.is_configured():
@@ -133,7 +214,7 @@ class SuggestionEngine:
         if not alternative_code:
             alternative_code = code
 
-        return {
+        suggestion = {
             "summary": str(parsed.get("summary") or "Model suggestion").strip(),
             "confidence": str(parsed.get("confidence") or "medium").strip(),
             "analysis_insights": self._normalize_analysis(parsed.get("analysis")),
@@ -141,3 +222,8 @@ class SuggestionEngine:
             "ai_model_used": self.ai_client.model if self.ai_client.is_configured() else None,
             "used_fallback": False,
         }
+        # Only model output is cached: the fallback is cheap and a later call may reach the model.
+        self._cache.put(cache_key, suggestion)
+        if self._store is not None:
+            self._store.put_suggestion(cache_key, suggestion)
+        return suggestion
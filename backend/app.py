@@ -1,71 +1,137 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
 import os
 import shutil
 import tempfile
+import uuid
 import zipfile
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import BinaryIO
 
-from flask import Flask, jsonify, request
-from flask_cors import CORS
-from werkzeug.utils import secure_filename
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 
 from analysis import SuggestionEngine, analyze_code_complexity, estimate_co2_impact, summarize_differences
 from analysis.project_analyzer import analyze_project
 
 try:  # pragma: no cover - allow running from repo root or backend dir
+    from services.analysis_cache import AnalysisCache
     from services.history_store import HistoryStore
-    from services.tracking import CodeCarbonSession
+    from services.job_store import JobStore
+    from services.json_codec import orjson
+    from services.lru_cache import LRUCache
+    from services.tracking import CodeCarbonSession, EmissionResult
 except ModuleNotFoundError:  # type: ignore
+    from backend.services.analysis_cache import AnalysisCache  # type: ignore
     from backend.services.history_store import HistoryStore  # type: ignore
-    from backend.services.tracking import CodeCarbonSession  # type: ignore
+    from backend.services.job_store import JobStore  # type: ignore
+    from backend.services.json_codec import orjson  # type: ignore
+    from backend.services.lru_cache import LRUCache  # type: ignore
+    from backend.services.tracking import CodeCarbonSession, EmissionResult  # type: ignore
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson, honouring ``sort_keys`` and ``compact``."""
+
+    def _encode(self, obj, sort_keys: bool, indent: bool) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs) -> str:
+        encoded = self._encode(obj, kwargs.get("sort_keys", self.sort_keys), bool(kwargs.get("indent")))
+        return encoded.decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            self._encode(obj, self.sort_keys, indent) + b"\n", mimetype=self.mimetype
+        )
+
 
 app = Flask(__name__)
-CORS(app)
+if orjson is not None:
+    app.json = ORJSONProvider(app)
 app.config["MAX_CONTENT_LENGTH"] = 300 * 1024 * 1024  # 300 MB max file size
-app.config["UPLOAD_FOLDER"] = tempfile.gettempdir()
 
-suggestion_engine = SuggestionEngine()
 history_store = HistoryStore()
+analysis_cache = AnalysisCache()
+suggestion_engine = SuggestionEngine(store=analysis_cache)
+# Suggestions for /api/analyze are network-bound; run them off the request thread so local
+# work can overlap. Project jobs use their own per-job pool.
+suggestion_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="suggest")
+metrics_cache = LRUCache(maxsize=256)
+analysis_results = LRUCache(maxsize=512)
 
+_HEALTH_BODY = b'{"status":"ok"}'
 
-@app.get("/api/health")
-def health_check():
-    return {"status": "ok"}
+# The API is consumed from a single frontend origin, so CORS headers are fixed up front.
+_CORS_HEADERS = {
+    "Access-Control-Allow-Origin": os.getenv("CORS_ORIGIN", "*"),
+    "Access-Control-Allow-Headers": "Content-Type",
+    "Access-Control-Allow-Methods": "GET,POST,OPTIONS",
+}
 
 
-@app.post("/api/analyze")
-def analyze_code():
-    payload = request.get_json(force=True, silent=True) or {}
-    code = payload.get("code", "")
-    language = payload.get("language", "python")
+@app.before_request
+def _cors_preflight():
+    if request.method == "OPTIONS":
+        return Response(status=204, headers=_CORS_HEADERS)
+    return None
 
-    if not code.strip():
-        return jsonify({"error": "Code input is required."}), 400
 
-    try:
-        before_metrics = analyze_code_complexity(code, language)
-    except ValueError as exc:
-        return jsonify({"error": str(exc)}), 400
+@app.after_request
+def _cors_headers(response: Response) -> Response:
+    response.headers.update(_CORS_HEADERS)
+    return response
+
+
+def _code_digest(code: str) -> bytes:
+    return hashlib.blake2b(code.encode("utf-8", errors="surrogatepass"), digest_size=16).digest()
+
 
-    with CodeCarbonSession() as session:
-        suggestion = suggestion_engine.generate(code, language, before_metrics)
-        alternative_code = suggestion.get("alternative_code", code)
+def _cached_complexity(code: str, language: str) -> dict:
+    """analyze_code_complexity memoized on a digest of the code, so large inputs aren't retained."""
+    key = (_code_digest(code), language)
+    metrics = metrics_cache.get(key)
+    if metrics is None:
+        metrics = analyze_code_complexity(code, language)
+        metrics_cache.put(key, metrics)
+    return metrics
 
+
+def _analyze_snippet(code: str, language: str, before_metrics: dict) -> dict:
+    """Run the suggestion and before/after comparison for one snippet."""
+    suggestion_future = suggestion_executor.submit(suggestion_engine.generate, code, language, before_metrics)
+    co2_before = estimate_co2_impact(before_metrics)
+
+    suggestion = suggestion_future.result()
+    alternative_code = suggestion.get("alternative_code", code)
+
+    if alternative_code == code:
+        after_metrics = before_metrics
+    else:
         try:
-            after_metrics = analyze_code_complexity(alternative_code, language)
+            after_metrics = _cached_complexity(alternative_code, language)
         except ValueError:
             after_metrics = before_metrics
 
-        co2_before = estimate_co2_impact(before_metrics)
-        co2_after = estimate_co2_impact(after_metrics)
-
-        comparison = summarize_differences(before_metrics, after_metrics)
-        energy_savings = round(max(co2_before["energy_kwh"] - co2_after["energy_kwh"], 0), 4)
+    co2_after = estimate_co2_impact(after_metrics)
 
-    emissions = session.result().as_dict()
+    comparison = summarize_differences(before_metrics, after_metrics)
+    energy_savings = round(max(co2_before["energy_kwh"] - co2_after["energy_kwh"], 0), 4)
 
-    response = {
+    return {
         "analysis": {
             "before": before_metrics,
             "after": after_metrics,
@@ -76,22 +142,72 @@ def analyze_code():
             "after": co2_after,
             "energy_saved_kwh": energy_savings,
         },
-        "session_emissions": emissions,
         "suggestion": suggestion,
         "alternative_code": alternative_code,
     }
-    history_store.insert(
+
+
+@app.get("/api/health")
+def health_check():
+    return Response(_HEALTH_BODY, mimetype="application/json")
+
+
+@app.post("/api/analyze")
+def analyze_code():
+    """Analyze one snippet and record it in the history.
+
+    The response carries ``history_version``, the id of the history row just written. The
+    recent-history list is only embedded when the request sets ``include_history``; other
+    clients can poll ``/api/history`` when the version moves past what they last loaded.
+    """
+    payload = request.get_json(force=True, silent=True) or {}
+    code = payload.get("code", "")
+    language = payload.get("language", "python")
+    # same truthy spellings as ?sync= on /api/analyze-project; "false" must not count
+    include_history = payload.get("include_history") in (True, "1", "true")
+
+    if not code.strip():
+        return jsonify({"error": "Code input is required."}), 400
+
+    cache_key = (language, _code_digest(code))
+    result = analysis_results.get(cache_key)
+    if result is not None:
+        # Served from memory, so there is no work for CodeCarbon to measure.
+        emissions = EmissionResult(energy_kwh=0.0, co2_kg=0.0, duration_s=0.0).as_dict()
+    else:
+        try:
+            before_metrics = _cached_complexity(code, language)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+
+        with CodeCarbonSession() as session:
+            result = _analyze_snippet(code, language, before_metrics)
+        emissions = session.result().as_dict()
+        # A fallback suggestion may mean the model was unreachable; retry it next time.
+        if not result["suggestion"].get("used_fallback"):
+            analysis_results.put(cache_key, result)
+
+    suggestion = result["suggestion"]
+    response = {
+        "analysis": result["analysis"],
+        "co2": result["co2"],
+        "session_emissions": emissions,
+        "suggestion": suggestion,
+        "alternative_code": result["alternative_code"],
+    }
+    response["history_version"] = history_store.insert(
         language=language,
         summary=str(suggestion.get("summary", "")),
         ai_model=suggestion.get("ai_model_used"),
         used_fallback=bool(suggestion.get("used_fallback")),
-        before_metrics=before_metrics,
-        after_metrics=after_metrics,
+        before_metrics=response["analysis"]["before"],
+        after_metrics=response["analysis"]["after"],
         co2_projection=response["co2"],
         session_emissions=emissions,
-        alternative_code=alternative_code,
+        alternative_code=response["alternative_code"],
     )
-    response["history"] = history_store.recent(limit=10)
+    if include_history:
+        response["history"] = history_store.recent(limit=10)
     return jsonify(response)
 
 
@@ -105,84 +221,84 @@ def dashboard_summary():
     return jsonify(history_store.dashboard(limit=25))
 
 
-def extract_zip_file(zip_path: str, extract_to: str) -> dict[str, str]:
-    """Extract zip file and return dict of file paths to content."""
+_SUPPORTED_EXTENSIONS = frozenset({"py", "java", "js", "jsx", "html", "htm", "css"})
+ZIP_READ_WORKERS = min(8, os.cpu_count() or 4)
+ZIP_READ_BUFFER = 1 << 20  # 1 MiB chunks when copying an upload into a job spool
+
+
+def _read_zip_entry(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo) -> tuple[str, str | None]:
+    try:
+        with zip_ref.open(info, "r") as f:
+            return info.filename, f.read().decode("utf-8", errors="ignore")
+    except Exception:
+        return info.filename, None
+
+
+def extract_zip_file(zip_src: BinaryIO) -> dict[str, str]:
+    """Read supported source files straight out of a zip, without extracting it to disk.
+
+    ``zip_src`` is a seekable binary file object such as the upload stream or a job's spool.
+    """
     files_content: dict[str, str] = {}
     
-    with zipfile.ZipFile(zip_path, "r") as zip_ref:
-        # Get list of file names in zip
-        file_list = zip_ref.namelist()
-        
-        # Extract all files
-        zip_ref.extractall(extract_to)
-        
-        # Read supported file types
-        supported_extensions = {".py", ".java", ".js", ".jsx", ".html", ".htm", ".css"}
-        
-        for file_name in file_list:
-            full_path = os.path.join(extract_to, file_name)
-            
+    with zipfile.ZipFile(zip_src, "r") as zip_ref:
+        candidates = []
+        for info in zip_ref.infolist():
             # Skip directories and unsupported files
-            if os.path.isdir(full_path):
+            if info.is_dir():
                 continue
             
-            file_ext = Path(file_name).suffix.lower()
-            if file_ext not in supported_extensions:
+            # Same rule as Path.suffix: the dot must be in the last component and not lead it
+            name = info.filename
+            dot = name.rfind(".")
+            if dot <= name.rfind("/") + 1 or name[dot + 1:].lower() not in _SUPPORTED_EXTENSIONS:
                 continue
             
             # Skip files that are too large (safety check)
-            if os.path.getsize(full_path) > 10 * 1024 * 1024:  # 10 MB per file
+            if info.file_size > 10 * 1024 * 1024:  # 10 MB per file
                 continue
             
-            try:
-                with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-                    # Use relative path from extract root
-                    rel_path = os.path.relpath(full_path, extract_to)
-                    files_content[rel_path] = content
-            except Exception:
-                continue
+            candidates.append(info)
+        
+        # zlib releases the GIL while inflating, so entries decompress in parallel. ZipFile
+        # serializes the underlying seek+read with its own lock, so one handle can be shared.
+        with ThreadPoolExecutor(max_workers=ZIP_READ_WORKERS) as executor:
+            for name, content in executor.map(lambda info: _read_zip_entry(zip_ref, info), candidates):
+                if content is not None:
+                    files_content[name] = content
     
     return files_content
 
 
-@app.post("/api/analyze-project")
-def analyze_project_upload():
-    """Handle zip file upload and analyze entire project."""
-    if "file" not in request.files:
-        return jsonify({"error": "No file uploaded"}), 400
-    
-    file = request.files["file"]
-    if file.filename == "":
-        return jsonify({"error": "No file selected"}), 400
-    
-    if not file.filename.endswith(".zip"):
-        return jsonify({"error": "Only ZIP files are supported"}), 400
-    
-    # Save uploaded file temporarily
-    filename = secure_filename(file.filename)
-    temp_zip_path = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-    file.save(temp_zip_path)
-    
-    # Create temporary extraction directory
-    extract_dir = tempfile.mkdtemp()
-    
+# Project uploads run as background jobs so a large archive doesn't hold a request thread.
+# Threads suffice: the CPU-heavy per-file analysis already fans out to a process pool.
+PROJECT_JOB_WORKERS = 2
+PROJECT_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+project_executor = ThreadPoolExecutor(max_workers=PROJECT_JOB_WORKERS, thread_name_prefix="project")
+# Job state is kept in SQLite so a poll can land on any worker process.
+job_store = JobStore()
+
+
+def _run_project_analysis(zip_src: BinaryIO) -> tuple[dict, int]:
+    """Extract and analyze an uploaded project, returning the JSON payload and HTTP status."""
     try:
-        # Extract zip file
-        project_files = extract_zip_file(temp_zip_path, extract_dir)
+        project_files = extract_zip_file(zip_src)
         
         if not project_files:
-            return jsonify({"error": "No supported files found in ZIP archive"}), 400
+            return {"error": "No supported files found in ZIP archive"}, 400
         
         # Analyze project
         with CodeCarbonSession() as session:
-            project_analysis = analyze_project(project_files, project_root=extract_dir)
+            project_analysis = analyze_project(project_files, cache=analysis_cache)
             
-            # Calculate aggregate CO2 impact
-            total_before_complexity = sum(
-                f.get("metrics", {}).get("estimated_complexity", 0)
-                for f in project_analysis["files"].values()
-            )
+            # One pass over the files: aggregate complexity and rank files for suggestions
+            total_before_complexity = 0
+            ranked_files = []
+            for path, file_data in project_analysis["files"].items():
+                complexity = file_data.get("metrics", {}).get("estimated_complexity", 0)
+                total_before_complexity += complexity
+                ranked_files.append((complexity, path, file_data))
             total_before_loc = project_analysis["summary"]["total_lines_of_code"]
             
             # Estimate CO2 for entire project
@@ -192,31 +308,37 @@ def analyze_project_upload():
             }
             co2_before = estimate_co2_impact(aggregate_metrics)
             
-            # Generate suggestions for key files (top 5 by complexity)
-            file_complexities = [
-                (path, f.get("metrics", {}).get("estimated_complexity", 0))
-                for path, f in project_analysis["files"].items()
+            # Generate suggestions for key files (top 5 by complexity), requested all at once
+            # so their model round-trips overlap. The pool is per job so project uploads can't
+            # queue ahead of interactive /api/analyze requests on suggestion_executor.
+            top_files = [
+                (filepath, file_data)
+                for _, filepath, file_data in heapq.nlargest(5, ranked_files, key=itemgetter(0))
+                if "error" not in file_data
             ]
-            file_complexities.sort(key=lambda x: x[1], reverse=True)
-            
             suggestions = []
-            for filepath, _ in file_complexities[:5]:
-                file_data = project_analysis["files"][filepath]
-                if "error" in file_data:
-                    continue
-                
-                language = file_data["language"]
-                content = project_files.get(filepath, "")
-                metrics = file_data["metrics"]
-                
-                try:
-                    suggestion = suggestion_engine.generate(content, language, metrics)
-                    suggestions.append({
-                        "file": filepath,
-                        "suggestion": suggestion,
-                    })
-                except Exception:
-                    pass
+            if top_files:
+                with ThreadPoolExecutor(max_workers=len(top_files), thread_name_prefix="project-suggest") as executor:
+                    pending = [
+                        (
+                            filepath,
+                            executor.submit(
+                                suggestion_engine.generate,
+                                project_files.get(filepath, ""),
+                                file_data["language"],
+                                file_data["metrics"],
+                            ),
+                        )
+                        for filepath, file_data in top_files
+                    ]
+                    for filepath, future in pending:
+                        try:
+                            suggestions.append({
+                                "file": filepath,
+                                "suggestion": future.result(),
+                            })
+                        except Exception:
+                            pass
         
         emissions = session.result().as_dict()
         
@@ -243,22 +365,74 @@ def analyze_project_upload():
             alternative_code="",
         )
         
-        return jsonify(response)
+        return response, 200
     
     except zipfile.BadZipFile:
-        return jsonify({"error": "Invalid ZIP file"}), 400
+        return {"error": "Invalid ZIP file"}, 400
     except Exception as e:
-        return jsonify({"error": f"Error processing project: {str(e)}"}), 500
+        return {"error": f"Error processing project: {str(e)}"}, 500
+
+
+def _run_project_job(job_id: str, spool: BinaryIO) -> None:
+    try:
+        payload, status = _run_project_analysis(spool)
+    except Exception as e:
+        payload, status = {"error": f"Error processing project: {str(e)}"}, 500
     finally:
-        # Cleanup
-        try:
-            os.remove(temp_zip_path)
-        except Exception:
-            pass
-        try:
-            shutil.rmtree(extract_dir, ignore_errors=True)
-        except Exception:
-            pass
+        spool.close()
+    job_store.finish(job_id, payload, status)
+
+
+def _submit_project_job(spool: BinaryIO) -> str:
+    job_id = uuid.uuid4().hex
+    job_store.create(job_id)
+    project_executor.submit(_run_project_job, job_id, spool)
+    return job_id
+
+
+@app.post("/api/analyze-project")
+def analyze_project_upload():
+    """Handle zip file upload and analyze entire project.
+
+    Responds 202 with a ``job_id`` to poll at ``/api/analyze-project/<job_id>``; pass
+    ``?sync=1`` to wait for the analysis in the request instead.
+    """
+    if "file" not in request.files:
+        return jsonify({"error": "No file uploaded"}), 400
+    
+    file = request.files["file"]
+    if file.filename == "":
+        return jsonify({"error": "No file selected"}), 400
+    
+    if not file.filename.endswith(".zip"):
+        return jsonify({"error": "Only ZIP files are supported"}), 400
+    
+    if request.args.get("sync") in {"1", "true"}:
+        # Werkzeug spools uploads to a seekable temp file, so read the archive from it directly
+        payload, status = _run_project_analysis(file.stream)
+        return jsonify(payload), status
+    
+    # The upload stream is closed when the request ends, so hand the job its own copy
+    spool = tempfile.SpooledTemporaryFile(max_size=PROJECT_SPOOL_MAX_MEMORY)
+    try:
+        shutil.copyfileobj(file.stream, spool, ZIP_READ_BUFFER)
+        spool.seek(0)
+    except Exception:
+        spool.close()
+        raise
+    job_id = _submit_project_job(spool)
+    return jsonify({"job_id": job_id, "status": "pending"}), 202
+
+
+@app.get("/api/analyze-project/<job_id>")
+def project_job_status(job_id: str):
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    state, status, payload = job
+    if state == "pending":
+        return jsonify({"job_id": job_id, "status": "pending"}), 202
+    return Response(payload, status=status, mimetype="application/json")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+"""SQLite-backed cache of per-file analysis results and model suggestions keyed by content hash."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .json_codec import dumps, loads
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "analysis_cache.db")
+
+# Bump when the complexity heuristics or import patterns change so stale results are ignored.
+CACHE_VERSION = "1"
+
+# Model suggestions are kept for a day so prompt or model tweaks eventually take effect.
+SUGGESTION_TTL_S = 24 * 60 * 60
+
+CachedAnalysis = Tuple[Dict[str, float], List[str]]
+
+
+class AnalysisCache:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH) -> None:
+        self.db_path = os.path.abspath(db_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, check_same_thread=False)
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis (
+                    hash TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    metrics TEXT NOT NULL,
+                    dependencies TEXT NOT NULL,
+                    PRIMARY KEY (hash, language)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS suggestions (
+                    key TEXT PRIMARY KEY,
+                    suggestion TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            conn.commit()
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        digest = hashlib.sha256(CACHE_VERSION.encode())
+        digest.update(content.encode("utf-8", errors="surrogatepass"))
+        return digest.hexdigest()
+
+    def lookup(self, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], CachedAnalysis]:
+        """Return cached ``(metrics, dependencies)`` for the given ``(hash, language)`` keys."""
+
+        found: Dict[Tuple[str, str], CachedAnalysis] = {}
+        with self._lock, self._connect() as conn:
+            for content_hash, language in keys:
+                row = conn.execute(
+                    "SELECT metrics, dependencies FROM analysis WHERE hash = ? AND language = ?",
+                    (content_hash, language),
+                ).fetchone()
+                if row:
+                    found[(content_hash, language)] = (loads(row[0]), loads(row[1]))
+        return found
+
+    def store(self, entries: Iterable[Tuple[str, str, Dict[str, float], List[str]]]) -> None:
+        """Persist ``(hash, language, metrics, dependencies)`` rows in a single transaction."""
+
+        rows = [
+            (content_hash, language, dumps(metrics), dumps(dependencies))
+            for content_hash, language, metrics, dependencies in entries
+        ]
+        if not rows:
+            return
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO analysis (hash, language, metrics, dependencies)
+                VALUES (?, ?, ?, ?)
+                """,
+                rows,
+            )
+            conn.commit()
+
+    def get_suggestion(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a stored suggestion for ``key`` unless it is older than ``SUGGESTION_TTL_S``."""
+
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT suggestion FROM suggestions WHERE key = ? AND created_at >= ?",
+                (key, time.time() - SUGGESTION_TTL_S),
+            ).fetchone()
+        return loads(row[0]) if row else None
+
+    def put_suggestion(self, key: str, suggestion: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO suggestions (key, suggestion, created_at) VALUES (?, ?, ?)",
+                (key, dumps(suggestion), now),
+            )
+            conn.execute("DELETE FROM suggestions WHERE created_at < ?", (now - SUGGESTION_TTL_S,))
+            conn.commit()
@@ -2,29 +2,72 @@
 
 from __future__ import annotations
 
-import json
 import os
 import sqlite3
 import threading
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+from .json_codec import dumps, loads
 
 DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "history.db")
 
 
+def _as_number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
 class HistoryStore:
+    _RECENT_SQL = """
+        SELECT id, language, summary, ai_model, used_fallback, before_metrics,
+               after_metrics, co2_projection, session_emissions, created_at
+        FROM history
+        ORDER BY id DESC
+        LIMIT ?
+    """
+
+    # Per-run savings are extracted and clamped in SQLite so the dashboard never decodes
+    # the stored JSON blobs in Python.
+    _DASHBOARD_SQL = """
+        SELECT id, language, summary, created_at,
+               MAX(COALESCE(json_extract(co2_projection, '$.before.co2_kg'), 0)
+                   - COALESCE(json_extract(co2_projection, '$.after.co2_kg'), 0), 0.0),
+               MAX(COALESCE(json_extract(before_metrics, '$.estimated_complexity'), 0)
+                   - COALESCE(json_extract(after_metrics, '$.estimated_complexity'), 0), 0.0)
+        FROM history
+        ORDER BY id DESC
+        LIMIT ?
+    """
+
+    # Most recent runs kept in memory for the dashboard; larger limits go to SQLite.
+    DASHBOARD_WINDOW = 64
+
     def __init__(self, db_path: str = DEFAULT_DB_PATH) -> None:
         self.db_path = os.path.abspath(db_path)
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         self._lock = threading.Lock()
+        # One connection for the lifetime of the store; access is serialized by ``_lock``.
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.executescript(
+            "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY;"
+        )
+        # ``recent`` results per limit, tagged with the state they were read at.
+        self._version = 0
+        self._recent_cache: Dict[int, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+        # Dashboard rows (oldest first) in the _DASHBOARD_SQL column layout, kept current by
+        # ``insert``. Seeded lazily and re-read whenever another connection writes, which
+        # ``data_version`` reports; None means not loaded yet.
+        self._dashboard_rows: deque = deque(maxlen=self.DASHBOARD_WINDOW)
+        self._dashboard_data_version: Optional[int] = None
         self._init_db()
 
-    def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_path, check_same_thread=False)
-
     def _init_db(self) -> None:
-        with self._connect() as conn:
-            conn.execute(
+        with self._lock:
+            self._conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS history (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -41,7 +84,10 @@ class HistoryStore:
                 )
                 """
             )
-            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
 
     def insert(
         self,
@@ -56,20 +102,21 @@ class HistoryStore:
         session_emissions: Dict[str, Any],
         alternative_code: str,
     ) -> int:
+        created_at = datetime.now(timezone.utc).isoformat()
         payload = (
             language,
             summary,
             ai_model,
             int(used_fallback),
-            json.dumps(before_metrics),
-            json.dumps(after_metrics),
-            json.dumps(co2_projection),
-            json.dumps(session_emissions),
+            dumps(before_metrics),
+            dumps(after_metrics),
+            dumps(co2_projection),
+            dumps(session_emissions),
             alternative_code,
-            datetime.now(timezone.utc).isoformat(),
+            created_at,
         )
-        with self._lock, self._connect() as conn:
-            cursor = conn.execute(
+        with self._lock:
+            cursor = self._conn.execute(
                 """
                 INSERT INTO history (
                     language, summary, ai_model, used_fallback, before_metrics,
@@ -79,22 +126,50 @@ class HistoryStore:
                 """,
                 payload,
             )
-            conn.commit()
-            return int(cursor.lastrowid)
+            record_id = int(cursor.lastrowid)
+            self._version += 1
+            if self._dashboard_data_version is not None:
+                before_co2 = (co2_projection.get("before") or {}).get("co2_kg")
+                after_co2 = (co2_projection.get("after") or {}).get("co2_kg")
+                self._dashboard_rows.append(
+                    (
+                        record_id,
+                        language,
+                        summary,
+                        created_at,
+                        max(_as_number(before_co2) - _as_number(after_co2), 0.0),
+                        max(
+                            _as_number(before_metrics.get("estimated_complexity"))
+                            - _as_number(after_metrics.get("estimated_complexity")),
+                            0.0,
+                        ),
+                    )
+                )
+            return record_id
+
+    def _state_key(self) -> Tuple[int, int]:
+        # ``data_version`` changes when another connection (e.g. another worker process)
+        # commits, so memoized reads also notice writes made outside this store.
+        (data_version,) = self._conn.execute("PRAGMA data_version").fetchone()
+        return self._version, data_version
 
     def recent(self, limit: int = 10) -> List[Dict[str, Any]]:
-        with self._lock, self._connect() as conn:
-            cursor = conn.execute(
-                """
-                SELECT id, language, summary, ai_model, used_fallback, before_metrics,
-                       after_metrics, co2_projection, session_emissions, created_at
-                FROM history
-                ORDER BY id DESC
-                LIMIT ?
-                """,
-                (limit,),
-            )
-            rows = cursor.fetchall()
+        with self._lock:
+            state = self._state_key()
+            cached = self._recent_cache.get(limit)
+            if cached is not None and cached[0] == state:
+                return [dict(entry) for entry in cached[1]]
+            rows = self._conn.execute(self._RECENT_SQL, (limit,)).fetchall()
+
+        # identical metric blobs are common across runs; decode each distinct one once
+        decoded: Dict[str, Any] = {}
+
+        def _load(blob: str | None) -> Any:
+            blob = blob or "{}"
+            value = decoded.get(blob)
+            if value is None:
+                value = decoded[blob] = loads(blob)
+            return value
 
         history = []
         for row in rows:
@@ -117,20 +192,40 @@ class HistoryStore:
                     "summary": summary,
                     "ai_model": ai_model,
                     "used_fallback": bool(used_fallback),
-                    "before_metrics": json.loads(before_metrics or "{}"),
-                    "after_metrics": json.loads(after_metrics or "{}"),
-                    "co2_projection": json.loads(co2_projection or "{}"),
-                    "session_emissions": json.loads(session_emissions or "{}"),
+                    "before_metrics": _load(before_metrics),
+                    "after_metrics": _load(after_metrics),
+                    "co2_projection": _load(co2_projection),
+                    "session_emissions": _load(session_emissions),
                     "created_at": created_at,
                 }
             )
-        return history
+
+        with self._lock:
+            if len(self._recent_cache) >= 8 and limit not in self._recent_cache:
+                self._recent_cache.clear()
+            self._recent_cache[limit] = (state, history)
+        return [dict(entry) for entry in history]
+
+    def _dashboard_window(self, limit: int) -> List[Tuple[Any, ...]]:
+        """Newest-first dashboard rows, served from the in-memory window when it covers ``limit``."""
+        with self._lock:
+            if not 0 <= limit <= self.DASHBOARD_WINDOW:
+                return self._conn.execute(self._DASHBOARD_SQL, (limit,)).fetchall()
+            (data_version,) = self._conn.execute("PRAGMA data_version").fetchone()
+            if data_version != self._dashboard_data_version:
+                seeded = self._conn.execute(self._DASHBOARD_SQL, (self.DASHBOARD_WINDOW,)).fetchall()
+                self._dashboard_rows.clear()
+                self._dashboard_rows.extend(reversed(seeded))
+                self._dashboard_data_version = data_version
+            rows = list(self._dashboard_rows)
+        rows.reverse()
+        return rows[:limit]
 
     def dashboard(self, limit: int = 20, max_points: int = 12) -> Dict[str, Any]:
         """Return aggregated stats for dashboard visualizations."""
 
-        entries = self.recent(limit=limit)
-        if not entries:
+        rows = self._dashboard_window(limit)
+        if not rows:
             return {
                 "timeseries": [],
                 "totals": {
@@ -144,41 +239,29 @@ class HistoryStore:
                 "report": [],
             }
 
-        def _safe_number(value: Any, default: float = 0.0) -> float:
-            try:
-                return float(value)
-            except (TypeError, ValueError):
-                return default
-
         total_co2 = 0.0
         total_compile = 0.0
         timeseries: List[Dict[str, Any]] = []
 
         # ensure chronological order for charts
-        for entry in reversed(entries):
-            before_co2 = _safe_number(entry.get("co2_projection", {}).get("before", {}).get("co2_kg"))
-            after_co2 = _safe_number(entry.get("co2_projection", {}).get("after", {}).get("co2_kg"))
-            before_complexity = _safe_number(entry.get("before_metrics", {}).get("estimated_complexity"))
-            after_complexity = _safe_number(entry.get("after_metrics", {}).get("estimated_complexity"))
-
-            co2_saved = max(before_co2 - after_co2, 0.0)
-            compile_saved = max(before_complexity - after_complexity, 0.0)
-
+        for record_id, language, summary, created_at, co2_saved, compile_saved in reversed(rows):
+            co2_saved = float(co2_saved)
+            compile_saved = float(compile_saved)
             total_co2 += co2_saved
             total_compile += compile_saved
 
             timeseries.append(
                 {
-                    "id": entry.get("id"),
-                    "created_at": entry.get("created_at"),
-                    "language": entry.get("language"),
-                    "summary": entry.get("summary"),
+                    "id": record_id,
+                    "created_at": created_at,
+                    "language": language,
+                    "summary": summary,
                     "co2_saved": round(co2_saved, 4),
                     "compile_time_saved": round(compile_saved, 2),
                 }
             )
 
-        run_count = len(entries)
+        run_count = len(rows)
         # trim to the most recent `max_points` items while keeping chronological order
         if max_points > 0 and len(timeseries) > max_points:
             timeseries = timeseries[-max_points:]
@@ -189,7 +272,7 @@ class HistoryStore:
             "co2_saved_avg": round(total_co2 / run_count, 4) if run_count else 0.0,
             "compile_time_saved_total": round(total_compile, 2),
             "compile_time_saved_avg": round(total_compile / run_count, 2) if run_count else 0.0,
-            "latest_summary": entries[0].get("summary", ""),
+            "latest_summary": rows[0][2],
         }
 
         report = [
@@ -0,0 +1,90 @@
+"""SQLite-backed status and results of background project-analysis jobs.
+
+Jobs run in whichever server process accepted the upload, but their state lives in SQLite
+so any worker process can answer a poll for them.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .analysis_cache import DEFAULT_DB_PATH
+from .json_codec import dumps
+
+# Finished results are kept this long after completion for the client to collect.
+JOB_RESULT_TTL_S = 15 * 60
+# A job still pending after this long is assumed lost with a crashed or restarted worker.
+JOB_PENDING_TTL_S = 60 * 60
+
+JobState = Tuple[str, Optional[int], Optional[str]]
+
+
+class JobStore:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH) -> None:
+        self.db_path = os.path.abspath(db_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, check_same_thread=False)
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS project_jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    http_status INTEGER,
+                    payload TEXT,
+                    created_at REAL NOT NULL,
+                    finished_at REAL
+                )
+                """
+            )
+            conn.commit()
+
+    def create(self, job_id: str) -> None:
+        """Register a pending job and drop expired ones."""
+
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """
+                DELETE FROM project_jobs
+                WHERE finished_at < ? OR (finished_at IS NULL AND created_at < ?)
+                """,
+                (now - JOB_RESULT_TTL_S, now - JOB_PENDING_TTL_S),
+            )
+            conn.execute(
+                "INSERT INTO project_jobs (id, status, created_at) VALUES (?, 'pending', ?)",
+                (job_id, now),
+            )
+            conn.commit()
+
+    def finish(self, job_id: str, payload: Dict[str, Any], http_status: int) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """
+                UPDATE project_jobs
+                SET status = 'done', http_status = ?, payload = ?, finished_at = ?
+                WHERE id = ?
+                """,
+                (http_status, dumps(payload), time.time(), job_id),
+            )
+            conn.commit()
+
+    def get(self, job_id: str) -> Optional[JobState]:
+        """Return ``(status, http_status, payload_json)``; the last two are None while pending."""
+
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT status, http_status, payload FROM project_jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        return tuple(row) if row else None
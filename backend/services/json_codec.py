@@ -0,0 +1,35 @@
+"""JSON encode/decode helpers that use orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # pragma: no cover - optional fast JSON codec
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+__all__ = ["dumps", "dumps_bytes", "loads", "orjson"]
+
+
+if orjson is not None:
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    # orjson's decode error subclasses ValueError, as json.JSONDecodeError does.
+    loads = orjson.loads
+
+else:
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+    loads = json.loads
@@ -6,6 +6,7 @@ import os
 from typing import Any, Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 class OllamaClient:
@@ -24,6 +25,11 @@ class OllamaClient:
             self.temperature = float(temperature) if temperature is not None else 0.2
         except ValueError:
             self.temperature = 0.2
+        # keep the connection to the Ollama server alive across suggestions
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
     def is_configured(self) -> bool:
         return bool(self.base_url and self.model)
@@ -41,7 +47,7 @@ class OllamaClient:
                 "num_predict": max_new_tokens,
             },
         }
-        response = requests.post(
+        response = self._session.post(
             f"{self.base_url}/api/generate",
             json=payload,
             timeout=self.timeout,
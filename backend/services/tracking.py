@@ -2,14 +2,51 @@
 
 from __future__ import annotations
 
+import os
+import queue
 import time
 from dataclasses import dataclass
 import inspect
-from typing import Dict, Optional
+from typing import Dict, FrozenSet, Optional
 
 from codecarbon import EmissionsTracker
 
 
+# Set DISABLE_CODECARBON=1 to skip energy measurement and only report request duration.
+TRACKING_DISABLED = os.getenv("DISABLE_CODECARBON", "").strip().lower() in {"1", "true", "yes"}
+
+# Idle trackers per country code. Building a tracker probes the hardware, so sessions borrow
+# one and measure with start_task/stop_task instead of constructing a fresh tracker each time.
+_TRACKER_POOLS: Dict[Optional[str], "queue.SimpleQueue[EmissionsTracker]"] = {}
+
+# Keyword arguments this CodeCarbon version accepts, resolved once at import.
+_TRACKER_INIT_PARAMS: FrozenSet[str] = frozenset(inspect.signature(EmissionsTracker.__init__).parameters)
+
+
+def _new_tracker(country_iso_code: Optional[str]) -> EmissionsTracker:
+    tracker_kwargs = {
+        "measure_power_secs": 1,
+        "tracking_mode": "process",
+        "log_level": "error",
+        "save_to_file": False,
+    }
+    if country_iso_code and "country_iso_code" in _TRACKER_INIT_PARAMS:
+        tracker_kwargs["country_iso_code"] = country_iso_code
+    return EmissionsTracker(**tracker_kwargs)
+
+
+def _acquire_tracker(country_iso_code: Optional[str]) -> EmissionsTracker:
+    pool = _TRACKER_POOLS.setdefault(country_iso_code, queue.SimpleQueue())
+    try:
+        return pool.get_nowait()
+    except queue.Empty:
+        return _new_tracker(country_iso_code)
+
+
+def _release_tracker(country_iso_code: Optional[str], tracker: EmissionsTracker) -> None:
+    _TRACKER_POOLS.setdefault(country_iso_code, queue.SimpleQueue()).put(tracker)
+
+
 @dataclass
 class EmissionResult:
     energy_kwh: float
@@ -36,29 +73,21 @@ class CodeCarbonSession:
 
     def __enter__(self) -> "CodeCarbonSession":
         self._start_time = time.perf_counter()
-        tracker_kwargs = {
-            "measure_power_secs": 1,
-            "tracking_mode": "process",
-            "log_level": "error",
-            "save_to_file": False,
-        }
-        init_params = inspect.signature(EmissionsTracker.__init__).parameters
-        if self.country_iso_code and "country_iso_code" in init_params:
-            tracker_kwargs["country_iso_code"] = self.country_iso_code
-        self._tracker = EmissionsTracker(**tracker_kwargs)
-        self._tracker.start()
+        if not TRACKING_DISABLED:
+            self._tracker = _acquire_tracker(self.country_iso_code)
+            self._tracker.start_task()
         return self
 
     def __exit__(self, exc_type, exc, exc_tb) -> None:
         if self._tracker is not None:
-            emissions = self._tracker.stop()
-            if emissions is not None:
-                self._co2_kg = float(emissions)
-                data = getattr(self._tracker, "final_emissions_data", {}) or {}
-                if hasattr(data, "energy_consumed"):
-                    self._energy_kwh = float(getattr(data, "energy_consumed") or 0.0)
-                elif isinstance(data, dict):
-                    self._energy_kwh = float(data.get("energy_consumed", 0.0))
+            tracker, self._tracker = self._tracker, None
+            data = tracker.stop_task()
+            # the tracker is reused, so drop the finished task record instead of letting them pile up
+            getattr(tracker, "_tasks", {}).clear()
+            _release_tracker(self.country_iso_code, tracker)
+            if data is not None:
+                self._co2_kg = float(getattr(data, "emissions", 0.0) or 0.0)
+                self._energy_kwh = float(getattr(data, "energy_consumed", 0.0) or 0.0)
         if self._start_time is not None:
             self._duration = time.perf_counter() - self._start_time
 
@@ -166,7 +166,7 @@ const analyzeCode = async (code, language) => {
     const response = await fetch(BACKEND_URL, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ code, language }),
+      body: JSON.stringify({ code, language, include_history: true }),
     });
 
     const payload = await response.json();
@@ -214,6 +214,24 @@ const bootstrapHistory = async () => {
 };
 
 // Project upload functionality
+const PROJECT_POLL_INTERVAL_MS = 1000;
+
+// The backend analyzes uploads in the background; poll until the job finishes.
+const pollProjectJob = async (jobId) => {
+  for (;;) {
+    await new Promise((resolve) => setTimeout(resolve, PROJECT_POLL_INTERVAL_MS));
+    const response = await fetch(`${PROJECT_ANALYZE_URL}/${jobId}`);
+    const payload = await response.json();
+    if (response.status === 202) {
+      continue;
+    }
+    if (!response.ok) {
+      throw new Error(payload.error || "Analysis failed");
+    }
+    return payload;
+  }
+};
+
 const uploadArea = document.getElementById("upload-area");
 const projectFileInput = document.getElementById("project-file");
 const analyzeProjectBtn = document.getElementById("analyze-project-btn");
@@ -405,9 +423,10 @@ analyzeProjectBtn.addEventListener("click", async () => {
       body: formData,
     });
     
-    const payload = await response.json();
-    
-    if (!response.ok) {
+    let payload = await response.json();
+    if (response.status === 202 && payload.job_id) {
+      payload = await pollProjectJob(payload.job_id);
+    } else if (!response.ok) {
       throw new Error(payload.error || "Analysis failed");
     }
     